@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+METRIC_NAMES = [
+    'engagement_velocity', 'volatility_index', 'momentum_score',
+    'consistency_ratio', 'peak_performance_index', 'temporal_correlation',
+    'growth_trajectory', 'audience_retention_score'
+]
+
+
+def _local_times(timestamps):
+    timestamps = list(timestamps)
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(timestamps))
+    except ValueError:
+        # Mixed UTC offsets or formats; parse post by post and keep each one's own
+        # wall-clock time, as calculate_advanced_metrics does.
+        return pd.DatetimeIndex([pd.Timestamp(timestamp).tz_localize(None) for timestamp in timestamps])
+
+
+def temporal_columns(timestamps):
+    timestamps = _local_times(timestamps)
+    return np.column_stack([
+        timestamps.hour,
+        timestamps.dayofweek,
+        timestamps.month,
+        timestamps.dayofweek >= 5,
+        timestamps.quarter
+    ]).reshape(len(timestamps), 5).astype(float)
+
+
+def flatten_users(users):
+    names = [user_data['username'] for user_data in users]
+    counts = np.array([len(user_data.get('posts', [])) for user_data in users], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    posts = [post for user_data in users for post in user_data.get('posts', [])]
+    likes = np.array([post.get('likes', 0) for post in posts], dtype=float)
+    timestamps = [post['timestamp'] for post in posts]
+    return names, likes, offsets, timestamps
+
+
+def _safe_divide(numerator, denominator):
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                 np.asarray(denominator, dtype=float))
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator > 0)
+
+
+def _gather(values, index, valid):
+    if len(values) == 0:
+        return np.zeros(len(index))
+    return np.where(valid, values[np.clip(index, 0, len(values) - 1)], 0.0)
+
+
+def segment_owner_statistics(likes, temporal, offsets):
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(len(likes)) - offsets[:-1][owner]
+
+    def segment_sum(values):
+        return np.bincount(owner, values, minlength=len(counts))
+
+    center = _safe_divide(segment_sum(likes), counts)
+    y = likes - center[owner]
+    temporal_sums = [segment_sum(temporal[:, j]) for j in range(temporal.shape[1])]
+    x = temporal - np.column_stack([_safe_divide(s, counts) for s in temporal_sums])[owner] \
+        if len(owner) else temporal
+
+    statistics = {
+        'sum_y': segment_sum(y),
+        'sum_yy': segment_sum(y * y),
+        'sum_py': segment_sum(position * y),
+        'sum_x': np.column_stack([segment_sum(x[:, j]) for j in range(x.shape[1])]),
+        'sum_xx': np.column_stack([segment_sum(x[:, j] ** 2) for j in range(x.shape[1])]),
+        'sum_xy': np.column_stack([segment_sum(x[:, j] * y) for j in range(x.shape[1])])
+    }
+    return center, statistics
+
+
+def segment_maxima(values, offsets):
+    maxima = np.zeros(len(offsets) - 1)
+    non_empty = np.diff(offsets) > 0
+    if non_empty.any():
+        maxima[non_empty] = np.maximum.reduceat(values, offsets[:-1][non_empty])
+    return maxima
+
+
+def _temporal_correlation(n, statistics):
+    sum_y, sum_yy = statistics['sum_y'][:, None], statistics['sum_yy'][:, None]
+    sum_x, sum_xx, sum_xy = statistics['sum_x'], statistics['sum_xx'], statistics['sum_xy']
+
+    safe_n = np.maximum(n, 1)[:, None]
+    covariance = sum_xy - sum_x * sum_y / safe_n
+    var_x = sum_xx - sum_x ** 2 / safe_n
+    var_y = sum_yy - sum_y ** 2 / safe_n
+
+    # Constant columns have no defined correlation and pandas leaves them out of the mean.
+    defined = (var_x > 1e-9 * (1 + sum_xx)) & (var_y > 1e-9 * (1 + sum_yy))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlations = np.where(defined, np.abs(covariance) / np.sqrt(var_x * var_y), 0.0)
+        defined_count = defined.sum(axis=1)
+        result = np.where(defined_count > 0, correlations.sum(axis=1) / defined_count, np.nan)
+    return np.where(n > 0, result, 0.0)
+
+
+def metrics_from_statistics(likes, starts, ends, center, statistics, maxima):
+    n = ends - starts
+
+    centered_mean = _safe_divide(statistics['sum_y'], n)
+    mean = np.where(n > 0, centered_mean + center, 0.0)
+    std = np.sqrt(np.maximum(_safe_divide(statistics['sum_yy'], n) - centered_mean ** 2, 0))
+    positive_mean = (n > 0) & (mean > 0)
+
+    def tail_sum(size):
+        return sum(_gather(likes, ends - k, n >= k) for k in range(1, size + 1))
+
+    first, second = _gather(likes, starts, n >= 2), _gather(likes, starts + 1, n >= 2)
+    before_last, final = _gather(likes, ends - 2, n >= 2), _gather(likes, ends - 1, n >= 2)
+    gradient_sum = (second - first) + (final - before_last) + (final + before_last - first - second) / 2
+    engagement_velocity = np.where(n >= 2, _safe_divide(gradient_sum, n), 0.0)
+
+    volatility_index = np.where(positive_mean, _safe_divide(std, mean), 0.0)
+
+    recent_avg = tail_sum(3) / 3
+    historical_avg = np.where(n > 3, _safe_divide(mean * n - 3 * recent_avg, n - 3), mean)
+    momentum_score = np.where((n >= 3) & (historical_avg > 0),
+                              _safe_divide(recent_avg - historical_avg, historical_avg), 0.0)
+
+    consistency_ratio = np.where((n >= 2) & positive_mean, 1 / (1 + _safe_divide(std, mean)), 0.0)
+
+    peak_performance_index = np.where(positive_mean, _safe_divide(maxima, mean), 0.0)
+
+    temporal_correlation = _temporal_correlation(n, statistics)
+
+    # Closed-form least-squares slope over positions 0..n-1, replacing np.polyfit.
+    covariance = statistics['sum_py'] - (n - 1) / 2 * statistics['sum_y']
+    slope = _safe_divide(covariance, n * (n ** 2 - 1) / 12)
+    growth_trajectory = np.where((n >= 2) & positive_mean, _safe_divide(slope, mean), 0.0)
+
+    audience_retention_score = np.where((n >= 5) & (maxima > 0),
+                                        _safe_divide(tail_sum(5) / 5, maxima), 0.0)
+
+    return {
+        'engagement_velocity': engagement_velocity,
+        'volatility_index': volatility_index,
+        'momentum_score': momentum_score,
+        'consistency_ratio': consistency_ratio,
+        'peak_performance_index': peak_performance_index,
+        'temporal_correlation': temporal_correlation,
+        'growth_trajectory': growth_trajectory,
+        'audience_retention_score': audience_retention_score
+    }
+
+
+def calculate_metrics_batch(likes, offsets, timestamps):
+    likes = np.asarray(likes, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    center, statistics = segment_owner_statistics(likes, temporal_columns(timestamps), offsets)
+    return metrics_from_statistics(likes, offsets[:-1], offsets[1:], center, statistics,
+                                   segment_maxima(likes, offsets))
+
+
+def calculate_advanced_metrics_batch(users):
+    names, likes, offsets, timestamps = flatten_users(users)
+    metrics = calculate_metrics_batch(likes, offsets, timestamps)
+    return pd.DataFrame(metrics, index=pd.Index(names, name='username'))[METRIC_NAMES]
+
+
+def _mixed_history_users(n_users, rng):
+    users = []
+    for u in range(n_users):
+        n_posts = int(rng.choice([0, 1, 2, 3, 4, 5, 6, 7, 20, 60]))
+        start = pd.Timestamp('2024-01-01') + pd.Timedelta(days=int(rng.integers(0, 300)))
+        kind = rng.integers(4)
+        if kind == 0:
+            likes = rng.integers(0, 1000, n_posts)
+        elif kind == 1:
+            likes = np.full(n_posts, 7)
+        elif kind == 2:
+            likes = np.zeros(n_posts, dtype=int)
+        else:
+            likes = rng.lognormal(10, 2, n_posts).astype(int)
+        # Some users post everything at once, which leaves every temporal column constant.
+        hours = np.sort(rng.integers(0, 24 * 90, n_posts)) if rng.random() < 0.8 else np.zeros(n_posts, dtype=int)
+        # Others carry UTC offsets that differ from post to post.
+        suffixes = rng.choice(['', '+05:00', 'Z', '-08:00'], n_posts) if kind == 0 else [''] * n_posts
+        users.append({
+            'username': f'user_{u}',
+            'posts': [{'likes': int(l), 'timestamp': (start + pd.Timedelta(hours=int(h))).isoformat() + suffix}
+                      for l, h, suffix in zip(likes, hours, suffixes)]
+        })
+    return users
+
+
+def verify_against_reference(n_users=400, seed=3, rtol=1e-7, atol=1e-9):
+    from instagram import AdvancedEngagementAnalyzer
+
+    analyzer = AdvancedEngagementAnalyzer()
+    users = _mixed_history_users(n_users, np.random.default_rng(seed))
+    batch = calculate_advanced_metrics_batch(users)
+
+    # The per-user method raises in np.gradient on a single post, so there is nothing to compare.
+    comparable = [user for user in users if len(user['posts']) != 1]
+    reference = pd.DataFrame([analyzer.calculate_advanced_metrics(user) for user in comparable],
+                             index=[user['username'] for user in comparable])[METRIC_NAMES].astype(float)
+    batch = batch.loc[reference.index]
+
+    mismatches = {}
+    for name in METRIC_NAMES:
+        matches = np.isclose(batch[name].values, reference[name].values, rtol=rtol, atol=atol, equal_nan=True)
+        if not matches.all():
+            mismatches[name] = reference.index[~matches].tolist()
+
+    print(f"Batch Metrics vs calculate_advanced_metrics ({len(comparable)} of {n_users} users)")
+    print("=" * 60)
+    for name in METRIC_NAMES:
+        print(f"{name:<26} {'OK' if name not in mismatches else f'{len(mismatches[name])} mismatches'}")
+
+    if mismatches:
+        raise AssertionError(f"Batch kernel disagrees with the per-user method: {mismatches}")
+    return {'users_compared': len(comparable), 'mismatches': mismatches}
+
+if __name__ == "__main__":
+    verify_against_reference()
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from batch_metrics import METRIC_NAMES, flatten_users, metrics_from_statistics, temporal_columns
+
+TEMPORAL_WIDTH = 5
+
+
+def _to_utc(value):
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_convert('UTC').tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+
+def _to_day(values):
+    try:
+        timestamps = pd.to_datetime(pd.Series(values), utc=True).dt.tz_localize(None)
+    except ValueError:
+        # Naive and offset-carrying strings mixed in one batch; parse them one by one.
+        timestamps = pd.Series(pd.DatetimeIndex([_to_utc(value) for value in values]))
+    return (timestamps.values.astype('datetime64[D]').astype(np.int64), timestamps)
+
+
+class DailyFeatureStore:
+    def __init__(self, users):
+        names, likes, offsets, timestamps = flatten_users(users)
+        self.names = names
+        n_creators = len(names)
+        owner = np.repeat(np.arange(n_creators), np.diff(offsets))
+
+        days, parsed = _to_day(timestamps)
+        order = np.lexsort((parsed.values.astype(np.int64), owner))
+        self.likes = likes[order]
+        days = days[order]
+        temporal = temporal_columns([timestamps[i] for i in order]) if len(order) else np.zeros((0, TEMPORAL_WIDTH))
+        self.offsets = offsets
+
+        counts = np.diff(offsets)
+        position = np.arange(len(self.likes)) - offsets[:-1][owner]
+        self.center = np.divide(np.bincount(owner, self.likes, n_creators), counts,
+                                out=np.zeros(n_creators), where=counts > 0)
+        temporal_center = np.column_stack([
+            np.divide(np.bincount(owner, temporal[:, j], n_creators), counts,
+                      out=np.zeros(n_creators), where=counts > 0)
+            for j in range(TEMPORAL_WIDTH)
+        ])
+        y = self.likes - self.center[owner]
+        x = temporal - temporal_center[owner]
+
+        # One cell per (creator, active day), stored creator by creator, so a stray
+        # timestamp adds a single cell rather than widening a shared day axis.
+        new_cell = np.ones(len(days), dtype=bool)
+        new_cell[1:] = (owner[1:] != owner[:-1]) | (days[1:] != days[:-1])
+        cell = np.cumsum(new_cell) - 1
+        cell_owner = owner[new_cell]
+        n_cells = len(cell_owner)
+        self.cell_offsets = np.concatenate([[0], np.cumsum(np.bincount(cell_owner, minlength=n_creators))])
+
+        # Sorted (creator, day) keys; a window's cells are found with searchsorted.
+        self.first_day = int(days.min()) if len(days) else 0
+        self.day_span = int(days.max()) - self.first_day + 3 if len(days) else 3
+        self.cell_key = cell_owner * self.day_span + (days[new_cell] - self.first_day + 1)
+
+        columns = np.column_stack([np.ones(len(y)), y, y * y, position * y, x, x ** 2, x * y[:, None]])
+        totals = np.column_stack([np.bincount(cell, columns[:, j], n_cells) for j in range(columns.shape[1])])
+
+        # Running totals of additive aggregates over each creator's cells, with a zero
+        # row ahead of every creator; any window is the difference of two rows.
+        cells_per_creator = np.diff(self.cell_offsets)
+        prefix = np.zeros((n_cells + n_creators, columns.shape[1]))
+        for length in np.unique(cells_per_creator[cells_per_creator > 0]):
+            creators = np.flatnonzero(cells_per_creator == length)
+            rows = self.cell_offsets[creators][:, None] + np.arange(length)
+            prefix[rows + creators[:, None] + 1] = np.cumsum(totals[rows], axis=1)
+
+        self.count_prefix = np.rint(prefix[:, 0]).astype(np.int64)
+        self.prefix = {
+            'sum_y': prefix[:, 1],
+            'sum_yy': prefix[:, 2],
+            'sum_py': prefix[:, 3],
+            'sum_x': prefix[:, 4:4 + TEMPORAL_WIDTH],
+            'sum_xx': prefix[:, 4 + TEMPORAL_WIDTH:4 + 2 * TEMPORAL_WIDTH],
+            'sum_xy': prefix[:, 4 + 2 * TEMPORAL_WIDTH:]
+        }
+
+        # Sparse table of daily maxima: level j holds the max over 2**j consecutive
+        # cells, so a range max is two overlapping lookups.
+        cell_max = np.maximum.reduceat(self.likes, np.flatnonzero(new_cell)) if n_cells else np.zeros(0)
+        longest = int(cells_per_creator.max()) if n_creators else 0
+        levels = max(longest.bit_length(), 1)
+        self.max_table = np.full((levels, n_cells), -np.inf)
+        self.max_table[0] = cell_max
+        for level in range(1, levels):
+            width = 1 << (level - 1)
+            self.max_table[level, :n_cells - width] = np.maximum(self.max_table[level - 1, :n_cells - width],
+                                                                 self.max_table[level - 1, width:])
+
+    def _cell_bounds(self, start, end):
+        start_day, _ = _to_day([start])
+        end_day, _ = _to_day([end])
+        base = np.arange(len(self.names)) * self.day_span
+        first = np.clip(start_day[0] - self.first_day + 1, 0, self.day_span - 1)
+        last = np.clip(end_day[0] - self.first_day + 1, 0, self.day_span - 1)
+        lo = np.searchsorted(self.cell_key, base + first, side='left')
+        hi = np.searchsorted(self.cell_key, base + last, side='right')
+        return lo, np.maximum(hi, lo)
+
+    def _range_max(self, lo, hi):
+        maxima = np.zeros(len(lo))
+        present = hi > lo
+        lo, hi = lo[present], hi[present]
+        level = np.floor(np.log2(hi - lo)).astype(np.int64)
+        maxima[present] = np.maximum(self.max_table[level, lo], self.max_table[level, hi - (1 << level)])
+        return maxima
+
+    def window_metrics(self, start, end):
+        lo, hi = self._cell_bounds(start, end)
+        creators = np.arange(len(self.names))
+        first, last = lo + creators, hi + creators
+
+        before = self.count_prefix[first]
+        starts = self.offsets[:-1] + before
+        ends = self.offsets[:-1] + self.count_prefix[last]
+
+        statistics = {name: prefix[last] - prefix[first] for name, prefix in self.prefix.items()}
+        statistics['sum_py'] = statistics['sum_py'] - before * statistics['sum_y']
+
+        maxima = self._range_max(lo, hi)
+
+        metrics = metrics_from_statistics(self.likes, starts, ends, self.center, statistics, maxima)
+        return pd.DataFrame(metrics, index=pd.Index(self.names, name='username'))[METRIC_NAMES]
+
+    def windows_metrics(self, windows):
+        return {name: self.window_metrics(start, end) for name, (start, end) in windows.items()}
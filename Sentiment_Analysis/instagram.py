@@ -1,22 +1,27 @@
 import json
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, mean_squared_error
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Dense, LSTM, Dropout, BatchNormalization
 from tensorflow.keras.optimizers import Adam
+from model_factory import build_regressor, build_classifier
+from recommendations import RecommendationEngine
 import warnings
 warnings.filterwarnings('ignore')
 
 class AdvancedEngagementAnalyzer:
-    def __init__(self):
-        self.scaler = StandardScaler()
+    def __init__(self, precision='float64', training_mode='exact', subsample=None,
+                 early_stopping=False, n_iter_no_change=10):
+        self.dtype = np.dtype(precision)
+        self.scaler = StandardScaler(copy=self.dtype != np.float32)
         self.label_encoder = LabelEncoder()
-        self.rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.gb_classifier = GradientBoostingClassifier(n_estimators=100, random_state=42)
+        self.training_mode = training_mode
+        self.subsample = subsample
+        self.rf_model = build_regressor(training_mode, subsample)
+        self.gb_classifier = build_classifier(training_mode, early_stopping, n_iter_no_change)
         self.neural_network = None
         self.lstm_model = None
 
@@ -159,7 +164,7 @@ class AdvancedEngagementAnalyzer:
             metrics['temporal_correlation'],
             metrics['growth_trajectory'],
             metrics['audience_retention_score']
-        ]).reshape(1, -1)
+        ], dtype=self.dtype).reshape(1, -1)
 
         scaled_features = self.scaler.fit_transform(feature_vector)
 
@@ -183,6 +188,11 @@ class AdvancedEngagementAnalyzer:
         else:
             return 'Extreme Bearish'
 
+    def composite_score(self, metrics):
+        return (metrics['momentum_score'] * 0.25 +
+                metrics['consistency_ratio'] * 0.20 +
+                metrics['growth_trajectory'] * 0.20)
+
     def ensemble_prediction(self, features_matrix):
         rf_predictions = self.rf_model.predict(features_matrix)
         gb_predictions = self.gb_classifier.predict_proba(features_matrix)
@@ -215,24 +225,11 @@ class AdvancedEngagementAnalyzer:
             return 'High Risk'
 
     def generate_recommendations(self, analysis_results):
-        sorted_users = sorted(analysis_results.items(),
-                            key=lambda x: x[1]['composite_score'], reverse=True)
-
-        recommendations = {
-            'top_performers': [user for user, data in sorted_users[:5]],
-            'emerging_talents': [user for user, data in sorted_users
-                               if data['sentiment'] == 'Bullish'][:3],
-            'value_picks': [user for user, data in sorted_users
-                          if data['sentiment'] == 'Neutral' and
-                          data['growth_trajectory'] > 0][:3],
-            'avoid_list': [user for user, data in sorted_users
-                         if data['sentiment'] in ['Bearish', 'Extreme Bearish']]
-        }
-
-        return recommendations
+        engine = RecommendationEngine(top_k=5, emerging_k=3, value_k=3)
+        return engine.add_many(analysis_results.items()).recommendations()
 
-def main():
-    analyzer = AdvancedEngagementAnalyzer()
+def main(sink=None, precision='float64'):
+    analyzer = AdvancedEngagementAnalyzer(precision=precision)
 
     try:
         instagram_data = analyzer.load_data_from_json()
@@ -251,9 +248,7 @@ def main():
         analysis_results[username] = {
             'metrics': metrics,
             'sentiment': sentiment,
-            'composite_score': (metrics['momentum_score'] * 0.25 +
-                              metrics['consistency_ratio'] * 0.20 +
-                              metrics['growth_trajectory'] * 0.20)
+            'composite_score': analyzer.composite_score(metrics)
         }
 
         feature_vector = [
@@ -268,7 +263,15 @@ def main():
         ]
         features_matrix.append(feature_vector)
 
-    features_matrix = np.array(features_matrix)
+        if sink is not None:
+            sink.write({
+                'creator': username,
+                **metrics,
+                'composite_score': analysis_results[username]['composite_score'],
+                'sentiment': sentiment
+            })
+
+    features_matrix = np.array(features_matrix, dtype=analyzer.dtype)
 
     if len(features_matrix) > 10:
         analyzer.neural_network = analyzer.build_neural_network(features_matrix.shape[1])
@@ -282,6 +285,10 @@ def main():
     print(f"Portfolio Risk Level: {portfolio_risk}")
     print(f"Top Performers: {recommendations['top_performers']}")
 
+    if sink is not None:
+        sink.flush()
+        print(f"Wrote {len(analysis_results)} account records to {type(sink).__name__}")
+
     return analysis_results, recommendations
 
 if __name__ == "__main__":
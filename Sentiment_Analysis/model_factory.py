@@ -0,0 +1,36 @@
+import numpy as np
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingClassifier,
+                              HistGradientBoostingClassifier)
+
+TRAINING_MODES = ('exact', 'fast')
+
+
+def _check_mode(mode):
+    if mode not in TRAINING_MODES:
+        raise ValueError(f"Unknown training mode '{mode}', expected one of {TRAINING_MODES}")
+
+
+def build_regressor(mode='exact', subsample=None):
+    _check_mode(mode)
+    if mode == 'exact':
+        return RandomForestRegressor(n_estimators=100, random_state=42)
+    return RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1, max_samples=subsample)
+
+
+def build_classifier(mode='exact', early_stopping=False, n_iter_no_change=10):
+    _check_mode(mode)
+    if mode == 'exact':
+        return GradientBoostingClassifier(n_estimators=100, random_state=42)
+    # Early stopping is off by default: on clustered creator features it stops before
+    # the small clusters are fit and saves little time.
+    return HistGradientBoostingClassifier(max_iter=100, learning_rate=0.05, early_stopping=early_stopping,
+                                          validation_fraction=0.1, n_iter_no_change=n_iter_no_change,
+                                          random_state=42)
+
+
+def subsample_rows(n_rows, subsample=None, random_state=42):
+    if subsample is None or subsample >= 1.0:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(random_state)
+    size = max(int(n_rows * subsample), 1)
+    return np.sort(rng.choice(n_rows, size=size, replace=False))
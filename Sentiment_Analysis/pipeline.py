@@ -0,0 +1,283 @@
+import os
+import time
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+
+import numpy as np
+import pandas as pd
+
+from youtube import AdvancedEngagementAnalyzer as YouTubeAnalyzer
+from instagram import AdvancedEngagementAnalyzer as InstagramAnalyzer
+
+
+class Stage:
+    def __init__(self, name, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+class StageGraph:
+    def __init__(self, stages=(), max_workers=None):
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        for stage in stages:
+            self.add_stage(stage.name, stage.func, stage.deps)
+
+    def add_stage(self, name, func, deps=()):
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered")
+        self.stages[name] = Stage(name, func, deps)
+
+    def _validate(self):
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {missing}")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _run_stage(self, stage):
+        start = time.perf_counter()
+        try:
+            return stage.func(*[self.results[dep] for dep in stage.deps])
+        finally:
+            self.timings[stage.name] = time.perf_counter() - start
+
+    def run(self):
+        self._validate()
+        self.results, self.errors, self.timings = {}, {}, {}
+
+        waiting = dict(self.stages)
+        running = {}
+        skipped = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or running:
+                for name, stage in list(waiting.items()):
+                    if any(dep in self.errors or dep in skipped for dep in stage.deps):
+                        skipped.add(name)
+                        del waiting[name]
+                    elif all(dep in self.results for dep in stage.deps):
+                        running[pool.submit(self._run_stage, stage)] = name
+                        del waiting[name]
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as exc:
+                        self.errors[name] = exc
+
+        return self.results
+
+
+def _run_platform(build_stages, options, report, stage_workers):
+    start = time.perf_counter()
+    graph = StageGraph(build_stages(**options), max_workers=stage_workers)
+    graph.run()
+    # Only the report leaves the worker process; features, scores and models stay here.
+    return graph.results.get(report), graph.errors, graph.timings, time.perf_counter() - start
+
+
+class PipelineRunner:
+    def __init__(self, max_workers=None, stage_workers=None):
+        self.max_workers = max_workers
+        self.stage_workers = stage_workers
+        self.platforms = {}
+        self.reports = {}
+        self.errors = {}
+        self.timings = {}
+        self.platform_timings = {}
+
+    def add_platform(self, platform, build_stages, report='report', **options):
+        if platform in self.platforms:
+            raise ValueError(f"Platform '{platform}' is already registered")
+        self.platforms[platform] = (build_stages, report, options)
+
+    def run(self):
+        self.reports, self.errors, self.timings, self.platform_timings = {}, {}, {}, {}
+        if not self.platforms:
+            return self.merged_results()
+
+        # Stages are pure-Python loops that hold the GIL, so each platform's branch
+        # gets its own process rather than a thread.
+        with ProcessPoolExecutor(max_workers=self.max_workers or len(self.platforms)) as pool:
+            futures = {
+                pool.submit(_run_platform, build_stages, options, report, self.stage_workers): platform
+                for platform, (build_stages, report, options) in self.platforms.items()
+            }
+            for future in as_completed(futures):
+                platform = futures[future]
+                try:
+                    table, errors, timings, elapsed = future.result()
+                except Exception as exc:
+                    self.errors[platform] = exc
+                    continue
+
+                self.errors.update({f"{platform}.{name}": exc for name, exc in errors.items()})
+                self.timings.update({f"{platform}.{name}": t for name, t in timings.items()})
+                self.platform_timings[platform] = elapsed
+                if table is not None:
+                    self.reports[platform] = table
+
+        return self.merged_results()
+
+    def merged_results(self):
+        tables = [self.reports[platform].add_prefix(f"{platform}_")
+                  for platform in self.platforms if platform in self.reports]
+
+        if not tables:
+            return pd.DataFrame()
+
+        merged = pd.concat(tables, axis=1, join='outer')
+        merged.index.name = 'creator'
+        return merged
+
+
+def timing_check(runner, wall_time, tolerance=0.25):
+    branch_times = list(runner.platform_timings.values())
+    slowest, total = max(branch_times, default=0.0), sum(branch_times)
+    overlapped = wall_time <= slowest * (1 + tolerance)
+
+    print(f"\nWall time: {wall_time:.3f}s | Slowest platform: {slowest:.3f}s | Sum of platforms: {total:.3f}s")
+    for platform, elapsed in runner.platform_timings.items():
+        print(f"  {platform}: {elapsed:.3f}s")
+    if not overlapped:
+        print(f"Warning: wall time is not within {tolerance:.0%} of the slowest platform "
+              f"({os.cpu_count()} CPUs available), so the branches did not overlap")
+
+    return {'wall_time': wall_time, 'slowest': slowest, 'sum': total, 'overlapped': overlapped}
+
+
+def youtube_stages(analyzer=None):
+    analyzer = analyzer or YouTubeAnalyzer()
+
+    def load():
+        creators_data, _, _ = analyzer.load_content_data()
+        return creators_data
+
+    def features(creators_data):
+        names = list(creators_data)
+        matrix = np.array([analyzer.extract_advanced_features(creators_data[name]['videos'])
+                           for name in names], dtype=analyzer.dtype)
+        return names, matrix
+
+    def score(features_output):
+        _, matrix = features_output
+        scores, components = analyzer.calculate_sentiment_score(matrix.T)
+        return scores, components
+
+    def model(features_output):
+        _, matrix = features_output
+        # In-place scaling would race with the score stage reading the shared matrix.
+        return analyzer.build_ensemble_model(matrix if analyzer.scaler.copy else matrix.copy())
+
+    def classify(score_output):
+        scores, _ = score_output
+        return analyzer.classify_sentiment_batch(scores)
+
+    def report(features_output, score_output, sentiments, model_output):
+        names, _ = features_output
+        scores, components = score_output
+        _, cluster_labels = model_output
+
+        table = pd.DataFrame(components, index=names)
+        table['score'] = scores
+        table['sentiment'] = sentiments
+        table['cluster'] = cluster_labels
+        return table
+
+    return [
+        Stage('load', load),
+        Stage('features', features, ['load']),
+        Stage('score', score, ['features']),
+        Stage('model', model, ['features']),
+        Stage('classify', classify, ['score']),
+        Stage('report', report, ['features', 'score', 'classify', 'model'])
+    ]
+
+
+def instagram_stages(analyzer=None, file_path="/content/instagram_data.json"):
+    analyzer = analyzer or InstagramAnalyzer()
+
+    def load():
+        return analyzer.load_data_from_json(file_path)
+
+    def features(instagram_data):
+        names = [user_data['username'] for user_data in instagram_data]
+        metrics = [analyzer.calculate_advanced_metrics(user_data) for user_data in instagram_data]
+        return names, metrics
+
+    def score(features_output):
+        _, metrics = features_output
+        return np.array([analyzer.composite_score(m) for m in metrics])
+
+    def classify(features_output):
+        _, metrics = features_output
+        return [analyzer.advanced_sentiment_classification(m) for m in metrics]
+
+    def report(features_output, scores, sentiments):
+        names, metrics = features_output
+
+        table = pd.DataFrame(metrics, index=names)
+        table['score'] = scores
+        table['sentiment'] = sentiments
+        return table
+
+    return [
+        Stage('load', load),
+        Stage('features', features, ['load']),
+        Stage('score', score, ['features']),
+        Stage('classify', classify, ['features']),
+        Stage('report', report, ['features', 'score', 'classify'])
+    ]
+
+
+def build_default_pipeline(max_workers=None):
+    runner = PipelineRunner(max_workers=max_workers)
+    runner.add_platform('youtube', youtube_stages)
+    runner.add_platform('instagram', instagram_stages)
+    return runner
+
+
+def main():
+    runner = build_default_pipeline()
+
+    start = time.perf_counter()
+    merged = runner.run()
+    wall_time = time.perf_counter() - start
+
+    print("Cross-Platform Creator Sentiment Pipeline")
+    print("=" * 60)
+    for name, exc in runner.errors.items():
+        print(f"Stage {name} failed: {exc}")
+
+    print(merged.to_string())
+
+    timing_check(runner, wall_time)
+    return merged
+
+if __name__ == "__main__":
+    results = main()
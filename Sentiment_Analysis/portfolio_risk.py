@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def object_id(value):
+    if isinstance(value, dict):
+        return str(value.get('$oid'))
+    return str(value)
+
+
+def classify_risk(risk_scores):
+    labels = np.array(['Low Risk', 'Medium Risk', 'High Risk'])
+    return labels[np.searchsorted([0.2, 0.5], risk_scores, side='right')]
+
+
+def _risk_from_sums(volatility_sums, consistency_sums, counts):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        portfolio_volatility = volatility_sums / counts
+        portfolio_consistency = consistency_sums / counts
+        risk_scores = np.where(portfolio_consistency > 0,
+                               portfolio_volatility / portfolio_consistency, np.inf)
+    return portfolio_volatility, portfolio_consistency, risk_scores
+
+
+def score_portfolios(membership, volatility, consistency):
+    membership = sparse.csr_matrix(membership)
+    counts = np.asarray(membership.sum(axis=1), dtype=float).ravel()
+    return _risk_from_sums(membership @ volatility, membership @ consistency, counts)
+
+
+class PortfolioRiskEngine:
+    def __init__(self, creator_ids, volatility, consistency):
+        self.creator_ids = list(creator_ids)
+        self.creator_index = {creator: i for i, creator in enumerate(self.creator_ids)}
+        self.volatility = np.asarray(volatility, dtype=float)
+        self.consistency = np.asarray(consistency, dtype=float)
+
+        self.team_ids = []
+        self.team_index = {}
+        self.members = []
+        self.volatility_sums = np.zeros(0)
+        self.consistency_sums = np.zeros(0)
+        self.counts = np.zeros(0)
+
+    @classmethod
+    def from_metrics(cls, creator_metrics):
+        creator_ids = list(creator_metrics)
+        return cls(creator_ids,
+                   [creator_metrics[c]['volatility_index'] for c in creator_ids],
+                   [creator_metrics[c]['consistency_ratio'] for c in creator_ids])
+
+    def _creator_rows(self, creators):
+        unknown = [c for c in creators if c not in self.creator_index]
+        if unknown:
+            raise ValueError(f"No metrics for creators {unknown}")
+        return np.array([self.creator_index[c] for c in creators], dtype=np.int64)
+
+    def _grow(self, size):
+        if size <= len(self.counts):
+            return
+        capacity = max(size, 2 * len(self.counts))
+        for name in ('volatility_sums', 'consistency_sums', 'counts'):
+            grown = np.zeros(capacity)
+            current = getattr(self, name)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    def load_membership(self, team_ids, membership):
+        membership = sparse.csr_matrix(membership)
+        self.team_ids = list(team_ids)
+        self.team_index = {team: i for i, team in enumerate(self.team_ids)}
+        self.members = []
+        for start, end in zip(membership.indptr[:-1], membership.indptr[1:]):
+            self.members.append(np.repeat(membership.indices[start:end],
+                                          membership.data[start:end].astype(np.int64)))
+
+        self.volatility_sums = membership @ self.volatility
+        self.consistency_sums = membership @ self.consistency
+        self.counts = np.asarray(membership.sum(axis=1), dtype=float).ravel()
+
+    def load_user_teams(self, user_teams):
+        team_ids, rows, cols = [], [], []
+        for i, user_team in enumerate(user_teams):
+            team_ids.append(object_id(user_team.get('_id', i)))
+            creators = [object_id(team) for section in user_team.get('sections', [])
+                        for team in section.get('selectedTeams', [])]
+            cols.extend(self._creator_rows(creators))
+            rows.extend([i] * len(creators))
+
+        membership = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                       shape=(len(team_ids), len(self.creator_ids)))
+        self.load_membership(team_ids, membership)
+
+    def membership_matrix(self):
+        rows = np.repeat(np.arange(len(self.members)), [len(m) for m in self.members])
+        cols = np.concatenate(self.members) if self.members else np.zeros(0, dtype=np.int64)
+        return sparse.csr_matrix((np.ones(len(cols)), (rows, cols)),
+                                 shape=(len(self.members), len(self.creator_ids)))
+
+    def set_team(self, team_id, creators):
+        new_members = self._creator_rows(creators)
+
+        row = self.team_index.get(team_id)
+        if row is None:
+            row = len(self.team_ids)
+            self.team_ids.append(team_id)
+            self.team_index[team_id] = row
+            self.members.append(np.zeros(0, dtype=np.int64))
+            self._grow(row + 1)
+
+        old_members = self.members[row]
+        self.volatility_sums[row] += self.volatility[new_members].sum() - self.volatility[old_members].sum()
+        self.consistency_sums[row] += self.consistency[new_members].sum() - self.consistency[old_members].sum()
+        self.counts[row] = len(new_members)
+        self.members[row] = new_members
+
+    def remove_team(self, team_id):
+        self.set_team(team_id, [])
+
+    def update_metrics(self, volatility, consistency):
+        self.volatility = np.asarray(volatility, dtype=float)
+        self.consistency = np.asarray(consistency, dtype=float)
+        membership = self.membership_matrix()
+        self.volatility_sums = membership @ self.volatility
+        self.consistency_sums = membership @ self.consistency
+        self.counts = self.counts[:len(self.team_ids)].copy()
+
+    def results(self):
+        n_teams = len(self.team_ids)
+        counts = self.counts[:n_teams]
+        portfolio_volatility, portfolio_consistency, risk_scores = _risk_from_sums(
+            self.volatility_sums[:n_teams], self.consistency_sums[:n_teams], counts)
+
+        table = pd.DataFrame({
+            'volatility': portfolio_volatility,
+            'consistency': portfolio_consistency,
+            'risk_score': risk_scores,
+            'risk_level': classify_risk(risk_scores)
+        }, index=pd.Index(self.team_ids, name='team'))
+        return table[counts > 0]
@@ -0,0 +1,73 @@
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+from youtube import AdvancedEngagementAnalyzer
+
+
+def run_with_precision(creators_data, precision):
+    analyzer = AdvancedEngagementAnalyzer(precision=precision)
+    np.random.seed(42)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    feature_matrix = np.array([analyzer.extract_advanced_features(data['videos'])
+                               for data in creators_data.values()], dtype=analyzer.dtype)
+    scores, _ = analyzer.calculate_sentiment_score(feature_matrix.T)
+    pca_features, cluster_labels = analyzer.build_ensemble_model(feature_matrix)
+    sentiments = analyzer.classify_sentiment_batch(scores)
+
+    elapsed = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'scores': np.asarray(scores, dtype=np.float64),
+        'sentiments': np.array(sentiments),
+        'cluster_labels': cluster_labels,
+        'pca_features': pca_features,
+        'feature_importances': analyzer.rf_model.feature_importances_,
+        'feature_matrix_bytes': feature_matrix.nbytes,
+        'peak_bytes': peak_bytes,
+        'seconds': elapsed
+    }
+
+
+def compare_precision(n_creators=5000):
+    creators_data, _, _ = AdvancedEngagementAnalyzer().generate_synthetic_data(n_creators)
+
+    full = run_with_precision(creators_data, 'float64')
+    low = run_with_precision(creators_data, 'float32')
+
+    score_drift = np.abs(full['scores'] - low['scores'])
+    scale = np.maximum(np.abs(full['scores']), np.finfo(np.float32).tiny)
+
+    report = {
+        'feature_matrix_saved_bytes': full['feature_matrix_bytes'] - low['feature_matrix_bytes'],
+        'peak_saved_bytes': full['peak_bytes'] - low['peak_bytes'],
+        'peak_ratio': low['peak_bytes'] / full['peak_bytes'],
+        'max_abs_score_drift': score_drift.max(),
+        'max_rel_score_drift': (score_drift / scale).max(),
+        'sentiment_agreement': np.mean(full['sentiments'] == low['sentiments']),
+        'cluster_agreement_ari': adjusted_rand_score(full['cluster_labels'], low['cluster_labels']),
+        'max_importance_drift': np.abs(full['feature_importances'] - low['feature_importances']).max()
+    }
+
+    print(f"Precision Comparison ({n_creators} creators)")
+    print("=" * 60)
+    print(f"Feature matrix: {full['feature_matrix_bytes'] / 1e6:.2f} MB -> {low['feature_matrix_bytes'] / 1e6:.2f} MB")
+    print(f"Peak traced memory: {full['peak_bytes'] / 1e6:.2f} MB -> {low['peak_bytes'] / 1e6:.2f} MB "
+          f"({report['peak_ratio']:.2%})")
+    print(f"Run time: {full['seconds']:.3f}s -> {low['seconds']:.3f}s")
+    print(f"Max score drift: {report['max_abs_score_drift']:.3e} abs | {report['max_rel_score_drift']:.3e} rel")
+    print(f"Sentiment label agreement: {report['sentiment_agreement']:.4f}")
+    print(f"Cluster agreement (ARI): {report['cluster_agreement_ari']:.4f}")
+    print(f"Max feature importance drift: {report['max_importance_drift']:.3e}")
+
+    return report
+
+if __name__ == "__main__":
+    compare_precision()
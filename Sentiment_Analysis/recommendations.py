@@ -0,0 +1,63 @@
+import heapq
+
+
+class RecommendationEngine:
+    def __init__(self, top_k=5, emerging_k=3, value_k=3, avoid_k=None):
+        self.limits = {
+            'top_performers': top_k,
+            'emerging_talents': emerging_k,
+            'value_picks': value_k,
+            'avoid_list': avoid_k
+        }
+        self.heaps = {bucket: [] for bucket in self.limits}
+        self.seen = 0
+
+    def _growth_trajectory(self, data):
+        if 'growth_trajectory' in data:
+            return data['growth_trajectory']
+        return data.get('metrics', {}).get('growth_trajectory', 0)
+
+    def _buckets(self, data):
+        buckets = ['top_performers']
+        sentiment = data['sentiment']
+        if sentiment == 'Bullish':
+            buckets.append('emerging_talents')
+        elif sentiment == 'Neutral' and self._growth_trajectory(data) > 0:
+            buckets.append('value_picks')
+        elif sentiment in ['Bearish', 'Extreme Bearish']:
+            buckets.append('avoid_list')
+        return buckets
+
+    def _push(self, bucket, entry):
+        heap = self.heaps[bucket]
+        limit = self.limits[bucket]
+        if limit is None or len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, user, data):
+        # Earlier users win ties, matching the stable sort this replaces.
+        entry = (data['composite_score'], -self.seen, user)
+        for bucket in self._buckets(data):
+            self._push(bucket, entry)
+        self.seen += 1
+
+    def add_many(self, scored_users):
+        for user, data in scored_users:
+            self.add(user, data)
+        return self
+
+    def merge(self, other):
+        offset = self.seen
+        for bucket, heap in other.heaps.items():
+            for score, negative_seq, user in heap:
+                self._push(bucket, (score, negative_seq - offset, user))
+        self.seen += other.seen
+        return self
+
+    def recommendations(self):
+        return {
+            bucket: [user for _, _, user in sorted(heap, reverse=True)]
+            for bucket, heap in self.heaps.items()
+        }
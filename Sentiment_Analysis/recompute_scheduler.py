@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from portfolio_risk import object_id
+
+
+def _parse_time(value):
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = value.get('$date')
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp
+
+
+def _utc_now():
+    return pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+
+def _resolve_now(now):
+    return _utc_now() if now is None else _parse_time(now)
+
+
+def _date_value(timestamp):
+    # Extended JSON date in UTC, the shape mongoexport writes for TwitterQueue Date fields.
+    return {'$date': timestamp.isoformat(timespec='milliseconds') + 'Z'}
+
+
+class JsonQueueStore:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else [data]
+
+    def save(self, queues):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(queues, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class RecomputeScheduler:
+    def __init__(self, store, analyze, budget=100, cost=None):
+        self.store = store
+        self.analyze = analyze
+        self.budget = budget
+        self.cost = cost or (lambda team: 1)
+        self.errors = {}
+
+    def _team_key(self, team):
+        return object_id(team.get('teamId') or team.get('twitterId'))
+
+    def _is_open(self, queue, now):
+        if not queue.get('isActive', True):
+            return False
+        start, end = _parse_time(queue.get('startDate')), _parse_time(queue.get('endDate'))
+        return (start is None or start <= now) and (end is None or now <= end)
+
+    def _urgency(self, team, now):
+        last = _parse_time(team.get('lastProcessed'))
+        if last is None:
+            return np.inf
+        # Staleness keeps growing while a team waits, so low-priority teams climb
+        # the ranking until they fit in a tick and cannot starve.
+        stale_hours = max((now - last).total_seconds() / 3600, 0.0)
+        return stale_hours * (1 + max(team.get('priority', 0), 0))
+
+    def select(self, queues, now=None):
+        now = _resolve_now(now)
+
+        candidates = {}
+        for queue in queues:
+            if not self._is_open(queue, now):
+                continue
+            for team in queue.get('teamsToProcess', []):
+                key = self._team_key(team)
+                urgency = self._urgency(team, now)
+                entry = candidates.setdefault(key, {'team': team, 'urgency': urgency, 'entries': []})
+                entry['urgency'] = max(entry['urgency'], urgency)
+                entry['entries'].append(team)
+
+        ranked = sorted(candidates.items(),
+                        key=lambda item: (item[1]['urgency'], item[1]['team'].get('priority', 0)),
+                        reverse=True)
+
+        selected, spent = [], 0
+        for key, entry in ranked:
+            cost = self.cost(entry['team'])
+            if spent + cost > self.budget:
+                continue
+            selected.append((key, entry))
+            spent += cost
+
+        return selected
+
+    def tick(self, now=None):
+        now = _resolve_now(now)
+        queues = self.store.load()
+
+        results, self.errors = {}, {}
+        try:
+            for key, entry in self.select(queues, now):
+                try:
+                    results[key] = self.analyze(entry['team'])
+                except Exception as exc:
+                    self.errors[key] = exc
+                    error = f"{type(exc).__name__}: {exc}"
+                else:
+                    error = None
+
+                # Failed teams are stamped as well, so they wait their turn again
+                # instead of staying at infinite urgency and blocking every tick.
+                for team in entry['entries']:
+                    team['lastProcessed'] = _date_value(now)
+                    if error is None:
+                        team.pop('lastError', None)
+                    else:
+                        team['lastError'] = error
+        finally:
+            self.store.save(queues)
+        return results
+
+
+def metrics_job(analyzer, creators_data):
+    def analyze(team):
+        user_data = creators_data.get(team.get('twitterId'), {})
+        return analyzer.calculate_advanced_metrics(user_data)
+    return analyze
+
+
+def features_job(analyzer, creators_data):
+    def analyze(team):
+        videos = creators_data.get(team.get('twitterId'), {}).get('videos', [])
+        return analyzer.extract_advanced_features(videos)
+    return analyze
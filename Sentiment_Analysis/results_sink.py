@@ -0,0 +1,211 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PART_PATTERN = re.compile(r'part-(\d+)\.parquet')
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def _json_value(value):
+    # JSON has no NaN or Infinity, so non-finite floats become null.
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_json_value(item) for item in value]
+    return _to_builtin(value)
+
+
+class ResultsSink:
+    def __init__(self, batch_size=10000):
+        self.batch_size = batch_size
+        self.buffer = []
+        self.records_written = 0
+
+    def write(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        self._write_batch(self.buffer)
+        self.records_written += len(self.buffer)
+        self.buffer = []
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class NdjsonSink(ResultsSink):
+    def __init__(self, path, batch_size=10000, append=False):
+        super().__init__(batch_size)
+        self.file = open(path, 'a' if append else 'w')
+
+    def _write_batch(self, records):
+        self.file.write(''.join(json.dumps(_json_value(record), allow_nan=False) + '\n' for record in records))
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class ColumnarSink(ResultsSink):
+    def __init__(self, directory, batch_size=100000, append=False):
+        super().__init__(batch_size)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        existing = [int(match.group(1)) for match in map(PART_PATTERN.fullmatch, os.listdir(directory)) if match]
+        if existing and not append:
+            raise ValueError(f"{directory} already holds {len(existing)} parquet parts; "
+                             f"pass append=True to add to them or use an empty directory")
+        # Appended parts continue the numbering so earlier parts are never overwritten.
+        self.parts = max(existing) + 1 if existing else 0
+
+    def _write_batch(self, records):
+        frame = pd.DataFrame.from_records(records)
+        frame.to_parquet(os.path.join(self.directory, f"part-{self.parts:05d}.parquet"), index=False)
+        self.parts += 1
+
+
+class SqliteSink(ResultsSink):
+    def __init__(self, path, table='results', key='creator', batch_size=10000):
+        super().__init__(batch_size)
+        self.connection = sqlite3.connect(path)
+        self.table = table
+        self.key = key
+        self.columns = None
+
+    def _check_existing_table(self):
+        info = self.connection.execute(f'PRAGMA table_info("{self.table}")').fetchall()
+        if not info:
+            return
+
+        existing = [row[1] for row in info]
+        primary_key = [row[1] for row in info if row[5] > 0]
+        if primary_key != [self.key]:
+            raise ValueError(f"Existing table '{self.table}' has primary key {primary_key}, "
+                             f"upserts need '{self.key}' as its only primary key")
+        missing = [column for column in self.columns if column not in existing]
+        if missing:
+            raise ValueError(f"Existing table '{self.table}' has no columns {missing}; "
+                             f"write to a new table or migrate it first")
+
+    def _ensure_table(self, record):
+        self.columns = list(record)
+        if self.key not in self.columns:
+            raise ValueError(f"Records must contain the key column '{self.key}'")
+        self._check_existing_table()
+
+        column_sql = ', '.join(
+            f'"{column}" PRIMARY KEY' if column == self.key else f'"{column}"'
+            for column in self.columns
+        )
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({column_sql})')
+
+    def _write_batch(self, records):
+        if self.columns is None:
+            self._ensure_table(records[0])
+
+        names = ', '.join(f'"{column}"' for column in self.columns)
+        placeholders = ', '.join('?' for _ in self.columns)
+        updates = ', '.join(f'"{column}" = excluded."{column}"'
+                            for column in self.columns if column != self.key)
+        sql = (f'INSERT INTO "{self.table}" ({names}) VALUES ({placeholders}) '
+               f'ON CONFLICT("{self.key}") DO UPDATE SET {updates}')
+
+        rows = [tuple(_to_builtin(record.get(column)) for column in self.columns) for record in records]
+        with self.connection:
+            self.connection.executemany(sql, rows)
+
+    def close(self):
+        super().close()
+        self.connection.close()
+
+
+def _benchmark_records(n_records):
+    rng = np.random.default_rng(42)
+    sentiments = np.array(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+    columns = {
+        'engagement_velocity': rng.random(n_records),
+        'viral_coefficient': rng.random(n_records),
+        'audience_retention': rng.random(n_records),
+        'growth_momentum': rng.random(n_records),
+        'score': rng.random(n_records),
+        'sentiment': sentiments[rng.integers(0, 5, n_records)]
+    }
+    return [
+        {'creator': f"Creator_{i}", **{name: values[i].item() for name, values in columns.items()}}
+        for i in range(n_records)
+    ]
+
+
+def benchmark_sinks(n_records=100000):
+    records = _benchmark_records(n_records)
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull:
+            for record in records:
+                print(f"\n{record['creator']}:", file=devnull)
+                print(f"  Engagement Velocity: {record['engagement_velocity']:.6f}", file=devnull)
+                print(f"  Viral Coefficient: {record['viral_coefficient']:.6f}", file=devnull)
+                print(f"  Audience Retention: {record['audience_retention']:.6f}", file=devnull)
+                print(f"  Growth Momentum: {record['growth_momentum']:.6f}", file=devnull)
+                print(f"  Composite Score: {record['score']:.6f}", file=devnull)
+        timings['print loop (devnull)'] = time.perf_counter() - start
+
+        sinks = {
+            'ndjson': lambda: NdjsonSink(os.path.join(directory, 'results.ndjson')),
+            'sqlite upsert': lambda: SqliteSink(os.path.join(directory, 'results.db')),
+            'parquet': lambda: ColumnarSink(os.path.join(directory, 'parquet'))
+        }
+        for name, make_sink in sinks.items():
+            start = time.perf_counter()
+            try:
+                with make_sink() as sink:
+                    sink.write_many(records)
+            except ImportError as exc:
+                print(f"Skipping {name}: {exc}")
+                continue
+            timings[name] = time.perf_counter() - start
+
+    print(f"Results sink throughput ({n_records} records)")
+    print("=" * 60)
+    for name, seconds in timings.items():
+        print(f"{name:<22} {seconds:8.3f}s  {n_records / seconds:12,.0f} records/s")
+
+    return timings
+
+if __name__ == "__main__":
+    benchmark_sinks()
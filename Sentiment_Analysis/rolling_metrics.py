@@ -0,0 +1,179 @@
+import numbers
+
+import numpy as np
+import pandas as pd
+
+WINDOWS = {
+    '1h': pd.Timedelta(hours=1),
+    '24h': pd.Timedelta(hours=24),
+    '7d': pd.Timedelta(days=7)
+}
+
+# Long windows do not need five-minute resolution; hourly buckets keep the 7d ring
+# at 169 slots per account instead of 2017.
+WINDOW_BUCKETS = {
+    '7d': pd.Timedelta(hours=1)
+}
+
+FIELDS = ('posts', 'engagement', 'sentiment')
+
+
+class BucketRing:
+    def __init__(self, bucket_seconds, ring_size, capacity):
+        self.bucket_seconds = bucket_seconds
+        self.ring_size = ring_size
+        # Each slot holds cumulative totals up to and including its bucket, so any
+        # window sum is the difference of two slots.
+        self.cumulative = np.zeros((capacity, ring_size, len(FIELDS)))
+        self.current_bucket = None
+
+    def to_bucket(self, seconds):
+        return int(seconds // self.bucket_seconds)
+
+    def _slot(self, bucket):
+        return bucket % self.ring_size
+
+    def grow(self, capacity):
+        grown = np.zeros((capacity, self.ring_size, len(FIELDS)))
+        grown[:len(self.cumulative)] = self.cumulative
+        self.cumulative = grown
+
+    def advance(self, seconds, active):
+        bucket = self.to_bucket(seconds)
+        if self.current_bucket is None:
+            self.current_bucket = bucket
+            return
+        if bucket <= self.current_bucket:
+            return
+
+        steps = min(bucket - self.current_bucket, self.ring_size)
+        carried = self.cumulative[:active, self._slot(self.current_bucket)].copy()
+        slots = [self._slot(b) for b in range(bucket - steps + 1, bucket + 1)]
+        self.cumulative[:active, slots] = carried[:, None, :]
+        self.current_bucket = bucket
+
+    def holds(self, seconds):
+        return self.current_bucket - self.to_bucket(seconds) < self.ring_size - 1
+
+    def add(self, row, seconds, values):
+        slots = [self._slot(b) for b in range(self.to_bucket(seconds), self.current_bucket + 1)]
+        self.cumulative[row, slots] += values
+
+    def window_totals(self, rows, span):
+        now = self.cumulative[rows, self._slot(self.current_bucket)]
+        before = self.cumulative[rows, self._slot(self.current_bucket - span)]
+        return now - before
+
+
+class RollingWindowAggregator:
+    def __init__(self, bucket_size=pd.Timedelta(minutes=5), windows=None, bucket_sizes=None,
+                 initial_capacity=64):
+        windows = windows or WINDOWS
+        bucket_sizes = WINDOW_BUCKETS if bucket_sizes is None else bucket_sizes
+
+        spans = {}
+        for name, span in windows.items():
+            bucket_seconds = int(pd.Timedelta(bucket_sizes.get(name, bucket_size)).total_seconds())
+            spans[name] = (bucket_seconds, int(pd.Timedelta(span).total_seconds()) // bucket_seconds)
+        if min(span for _, span in spans.values()) < 2:
+            raise ValueError("every window must span at least two buckets")
+
+        # Windows that share a bucket size share one ring, sized for the longest of them.
+        ring_sizes = {}
+        for bucket_seconds, span in spans.values():
+            ring_sizes[bucket_seconds] = max(ring_sizes.get(bucket_seconds, 0), span + 1)
+        self.rings = {bucket_seconds: BucketRing(bucket_seconds, ring_size, initial_capacity)
+                      for bucket_seconds, ring_size in ring_sizes.items()}
+        self.windows = {name: (self.rings[bucket_seconds], span)
+                        for name, (bucket_seconds, span) in spans.items()}
+
+        self.account_index = {}
+        self.accounts = []
+        self.capacity = initial_capacity
+        self.started = False
+
+    def _to_seconds(self, timestamp):
+        return pd.Timestamp(timestamp).timestamp() if not isinstance(timestamp, numbers.Real) else timestamp
+
+    def _account_row(self, account):
+        row = self.account_index.get(account)
+        if row is not None:
+            return row
+
+        row = len(self.accounts)
+        if row == self.capacity:
+            self.capacity *= 2
+            for ring in self.rings.values():
+                ring.grow(self.capacity)
+        self.account_index[account] = row
+        self.accounts.append(account)
+        return row
+
+    def advance(self, timestamp):
+        seconds = self._to_seconds(timestamp)
+        for ring in self.rings.values():
+            ring.advance(seconds, len(self.accounts))
+        self.started = True
+
+    def add_post(self, account, post):
+        seconds = self._to_seconds(post['timestamp'])
+        self.advance(seconds)
+
+        engagement = post.get('likes', 0) + post.get('comments', 0) + post.get('shares', 0)
+        values = np.array([1.0, engagement, post.get('sentiment', 0.0)])
+
+        # A post too old for the fine ring can still count towards the coarse windows.
+        fits = [ring for ring in self.rings.values() if ring.holds(seconds)]
+        if not fits:
+            return False
+
+        row = self._account_row(account)
+        for ring in fits:
+            ring.add(row, seconds, values)
+        return True
+
+    def add_posts(self, account, posts):
+        for post in sorted(posts, key=lambda post: pd.Timestamp(post['timestamp'])):
+            self.add_post(account, post)
+
+    def _query_rows(self, rows, window, timestamp):
+        if timestamp is not None:
+            self.advance(timestamp)
+        ring, span = self.windows[window]
+        half = span // 2
+
+        totals = ring.window_totals(rows, span)
+        recent = ring.window_totals(rows, half)
+        earlier = totals - recent
+
+        posts = totals[:, 0]
+        sentiment = np.divide(totals[:, 2], posts, out=np.zeros_like(posts), where=posts > 0)
+        velocity = totals[:, 1] / (span * ring.bucket_seconds / 3600)
+
+        recent_avg = np.divide(recent[:, 1], recent[:, 0], out=np.zeros(len(rows)), where=recent[:, 0] > 0)
+        earlier_avg = np.divide(earlier[:, 1], earlier[:, 0], out=np.zeros(len(rows)), where=earlier[:, 0] > 0)
+        momentum = np.divide(recent_avg - earlier_avg, earlier_avg,
+                             out=np.zeros(len(rows)), where=earlier_avg > 0)
+
+        return {
+            'posts': posts.astype(int),
+            'sentiment': sentiment,
+            'engagement_velocity': velocity,
+            'momentum': momentum
+        }
+
+    def query(self, account, window, timestamp=None):
+        row = self.account_index.get(account)
+        if row is None or not self.started:
+            return {'posts': 0, 'sentiment': 0.0, 'engagement_velocity': 0.0, 'momentum': 0.0}
+
+        result = self._query_rows(np.array([row]), window, timestamp)
+        return {key: values[0].item() for key, values in result.items()}
+
+    def snapshot(self, window, timestamp=None):
+        if not self.accounts:
+            return pd.DataFrame(columns=['posts', 'sentiment', 'engagement_velocity', 'momentum'])
+
+        rows = np.arange(len(self.accounts))
+        result = self._query_rows(rows, window, timestamp)
+        return pd.DataFrame(result, index=pd.Index(self.accounts, name='account'))
@@ -0,0 +1,223 @@
+import math
+import multiprocessing
+import random
+import traceback
+
+import numpy as np
+
+from youtube import PERCENTILE_CUTS, SENTIMENT_LABELS, AdvancedEngagementAnalyzer
+
+
+class KllSketch:
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.rng = random.Random(seed)
+        self.compactors = [[]]
+        self.n = 0
+        self.size = 0
+        self.max_size = self._capacity(0)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _compress(self):
+        for level, items in enumerate(self.compactors):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            # Keep every other item with a random phase; each survivor doubles its weight.
+            offset = self.rng.randint(0, 1)
+            self.compactors[level + 1].extend(items[offset::2])
+            self.compactors[level] = leftover
+            break
+        self.size = sum(len(items) for items in self.compactors)
+
+    def update(self, value):
+        self.compactors[0].append(float(value))
+        self.n += 1
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def update_many(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        self.size = sum(len(items) for items in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    def _weighted_items(self):
+        values = np.concatenate([np.asarray(items, dtype=float) for items in self.compactors])
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.compactors)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    def rank_error_bound(self):
+        # Normalised rank error of one quantile query at 99% confidence, O(1/k).
+        # The constants are the Apache DataSketches fit for KLL with the same 2/3
+        # capacity decay; merging sketches does not loosen it.
+        return 2.296 / self.k ** 0.9723
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs):
+        values, cumulative = self._weighted_items()
+        targets = np.ceil(np.asarray(qs) * self.n)
+        positions = np.searchsorted(cumulative, targets, side='left')
+        return values[np.minimum(positions, len(values) - 1)]
+
+
+def classify_with_cut_points(scores, cut_points):
+    return SENTIMENT_LABELS[np.searchsorted(cut_points, scores, side='left')].tolist()
+
+
+def exact_cut_points(scores):
+    ordered = np.sort(scores)
+    ranks = np.maximum(np.ceil(np.asarray(PERCENTILE_CUTS) * len(ordered)).astype(int) - 1, 0)
+    return ordered[ranks]
+
+
+def score_partition(creators_data):
+    analyzer = AdvancedEngagementAnalyzer()
+    names = list(creators_data)
+    if not names:
+        return names, np.zeros(0)
+
+    feature_matrix = np.array([analyzer.extract_advanced_features(creators_data[name]['videos'])
+                               for name in names])
+    scores, _ = analyzer.calculate_sentiment_score(feature_matrix.T)
+    return names, np.asarray(scores, dtype=float)
+
+
+def _shard_worker(creators_data, k, seed, connection, collect_scores):
+    try:
+        names, scores = score_partition(creators_data)
+        connection.send(('sketch', KllSketch(k, seed).update_many(scores)))
+
+        cut_points = connection.recv()
+        result = {'labels': dict(zip(names, classify_with_cut_points(scores, cut_points)))}
+        if collect_scores:
+            result['scores'] = dict(zip(names, scores.tolist()))
+        connection.send(('result', result))
+    except EOFError:
+        # The coordinator gave up on this run and closed its end.
+        pass
+    except Exception:
+        try:
+            connection.send(('error', traceback.format_exc()))
+        except OSError:
+            pass
+    finally:
+        connection.close()
+
+
+def _receive(connection, shard_id):
+    try:
+        kind, payload = connection.recv()
+    except EOFError:
+        raise RuntimeError(f"Shard {shard_id} exited without sending a result")
+    if kind == 'error':
+        raise RuntimeError(f"Shard {shard_id} failed:\n{payload}")
+    return payload
+
+
+def partition_creators(creators_data, n_shards):
+    shards = [{} for _ in range(n_shards)]
+    for i, (name, data) in enumerate(creators_data.items()):
+        shards[i % n_shards][name] = data
+    return shards
+
+
+def run_sharded(creators_data, n_shards=4, k=200, seed=42, collect_scores=False):
+    context = multiprocessing.get_context()
+    connections, workers = [], []
+    for shard_id, shard in enumerate(partition_creators(creators_data, n_shards)):
+        parent, child = context.Pipe()
+        worker = context.Process(target=_shard_worker,
+                                 args=(shard, k, seed + shard_id, child, collect_scores))
+        worker.start()
+        child.close()
+        connections.append(parent)
+        workers.append(worker)
+
+    try:
+        sketches = [_receive(connection, shard_id) for shard_id, connection in enumerate(connections)]
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+        cut_points = merged.quantiles(PERCENTILE_CUTS) if merged.n else np.zeros(len(PERCENTILE_CUTS))
+
+        for connection in connections:
+            connection.send(cut_points)
+
+        labels, scores = {}, {}
+        for shard_id, connection in enumerate(connections):
+            result = _receive(connection, shard_id)
+            labels.update(result['labels'])
+            scores.update(result.get('scores', {}))
+    except BaseException:
+        # Healthy shards are blocked waiting for cut points that will never come.
+        for connection in connections:
+            connection.close()
+        for worker in workers:
+            worker.terminate()
+        raise
+    finally:
+        for worker in workers:
+            worker.join()
+
+    return {'labels': labels, 'scores': scores, 'cut_points': cut_points, 'sketch': merged}
+
+
+def sharded_error_report(n_creators=20000, n_shards=4, k=200):
+    creators_data, _, _ = AdvancedEngagementAnalyzer().generate_synthetic_data(n_creators)
+    result = run_sharded(creators_data, n_shards=n_shards, k=k, collect_scores=True)
+
+    names = list(result['scores'])
+    scores = np.array([result['scores'][name] for name in names])
+    ordered = np.sort(scores)
+    exact_labels = classify_with_cut_points(scores, exact_cut_points(scores))
+
+    # Rank error of a cut point: how far its position in the exact distribution is
+    # from the percentile it stands for.
+    cut_ranks = np.searchsorted(ordered, result['cut_points'], side='right') / len(ordered)
+    rank_errors = np.abs(cut_ranks - np.asarray(PERCENTILE_CUTS))
+    bound = result['sketch'].rank_error_bound()
+    within_bound = bool(rank_errors.max() <= bound)
+    agreement = np.mean([result['labels'][name] == label for name, label in zip(names, exact_labels)])
+
+    print(f"Sharded Classification ({n_creators} creators, {n_shards} shards, k={k})")
+    print("=" * 60)
+    for q, cut, error in zip(PERCENTILE_CUTS, result['cut_points'], rank_errors):
+        flag = '' if error <= bound else ' | exceeds bound'
+        print(f"p{int(q * 100):<3} cut {cut:.6f} | rank error {error:.4%}{flag}")
+    print(f"Max rank error: {rank_errors.max():.4%} | Bound for k={k}: {bound:.4%} (99% confidence per cut)")
+    print(f"Sketch retained {result['sketch'].size} of {len(scores)} scores")
+    print(f"Label agreement with exact percentiles: {agreement:.4%}")
+    if not within_bound:
+        print(f"Warning: measured rank error exceeds the k={k} bound")
+
+    return {'rank_errors': rank_errors, 'max_rank_error': rank_errors.max(), 'rank_error_bound': bound,
+            'within_bound': within_bound, 'label_agreement': agreement}
+
+if __name__ == "__main__":
+    sharded_error_report()
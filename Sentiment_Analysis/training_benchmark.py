@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+from youtube import AdvancedEngagementAnalyzer
+
+
+def _prepare(n_creators):
+    analyzer = AdvancedEngagementAnalyzer()
+    creators_data, _, _ = analyzer.generate_synthetic_data(n_creators)
+    return np.array([analyzer.extract_advanced_features(data['videos'])
+                     for data in creators_data.values()])
+
+
+def fit_with_mode(feature_matrix, training_mode, subsample=None, early_stopping=False):
+    analyzer = AdvancedEngagementAnalyzer(training_mode=training_mode, subsample=subsample,
+                                          early_stopping=early_stopping)
+    np.random.seed(42)
+
+    start = time.perf_counter()
+    _, cluster_labels = analyzer.build_ensemble_model(feature_matrix)
+    elapsed = time.perf_counter() - start
+
+    scaled_features = analyzer.scaler.transform(feature_matrix)
+    return {
+        'seconds': elapsed,
+        'iterations': getattr(analyzer.gb_classifier, 'n_iter_', None) or analyzer.gb_classifier.n_estimators_,
+        'cluster_labels': cluster_labels,
+        'predicted_labels': analyzer.gb_classifier.predict(scaled_features),
+        'feature_importances': analyzer.rf_model.feature_importances_
+    }
+
+
+def benchmark_training(n_creators=12000, subsample=0.5):
+    feature_matrix = _prepare(n_creators)
+
+    runs = {
+        'exact': fit_with_mode(feature_matrix, 'exact'),
+        'fast': fit_with_mode(feature_matrix, 'fast'),
+        'fast+early_stopping': fit_with_mode(feature_matrix, 'fast', early_stopping=True),
+        f'fast+subsample={subsample}': fit_with_mode(feature_matrix, 'fast', subsample)
+    }
+    baseline = runs['exact']
+
+    print(f"Ensemble Training Benchmark ({n_creators} creators)")
+    print("=" * 60)
+    print(f"{'mode':<24}{'fit s':>8}{'speedup':>9}{'iters':>7}{'label acc':>11}{'vs exact':>10}{'imp corr':>10}")
+
+    report = {}
+    for name, run in runs.items():
+        report[name] = {
+            'seconds': run['seconds'],
+            'speedup': baseline['seconds'] / run['seconds'],
+            'iterations': run['iterations'],
+            'cluster_label_accuracy': np.mean(run['predicted_labels'] == run['cluster_labels']),
+            'agreement_with_exact': adjusted_rand_score(baseline['predicted_labels'], run['predicted_labels']),
+            'importance_correlation': np.corrcoef(baseline['feature_importances'],
+                                                  run['feature_importances'])[0, 1]
+        }
+        row = report[name]
+        print(f"{name:<24}{row['seconds']:>8.2f}{row['speedup']:>8.1f}x{row['iterations']:>7}"
+              f"{row['cluster_label_accuracy']:>11.4f}{row['agreement_with_exact']:>10.4f}"
+              f"{row['importance_correlation']:>10.4f}")
+
+    return report
+
+if __name__ == "__main__":
+    benchmark_training()
@@ -1,20 +1,27 @@
 import json
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 from sklearn.metrics import silhouette_score
+from model_factory import build_regressor, build_classifier, subsample_rows
 import warnings
 warnings.filterwarnings('ignore')
 
+SENTIMENT_LABELS = np.array(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+PERCENTILE_CUTS = (0.40, 0.60, 0.80, 0.95)
+
 class AdvancedEngagementAnalyzer:
-    def __init__(self):
-        self.scaler = StandardScaler()
+    def __init__(self, precision='float64', training_mode='exact', subsample=None,
+                 early_stopping=False, n_iter_no_change=10):
+        self.dtype = np.dtype(precision)
+        self.scaler = StandardScaler(copy=self.dtype != np.float32)
         self.minmax_scaler = MinMaxScaler()
-        self.rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.gb_classifier = GradientBoostingClassifier(n_estimators=100, random_state=42)
+        self.training_mode = training_mode
+        self.subsample = subsample
+        self.rf_model = build_regressor(training_mode, subsample)
+        self.gb_classifier = build_classifier(training_mode, early_stopping, n_iter_no_change)
         self.kmeans = KMeans(n_clusters=5, random_state=42)
         self.pca = PCA(n_components=3)
         self.sentiment_weights = {
@@ -36,9 +43,9 @@ class AdvancedEngagementAnalyzer:
         except FileNotFoundError:
             return self.generate_synthetic_data()
 
-    def generate_synthetic_data(self):
+    def generate_synthetic_data(self, n_creators=30):
         np.random.seed(42)
-        creators = [f"Creator_{i}" for i in range(30)]
+        creators = [f"Creator_{i}" for i in range(n_creators)]
         creators_data = {}
 
         for creator in creators:
@@ -60,7 +67,7 @@ class AdvancedEngagementAnalyzer:
 
     def extract_advanced_features(self, videos):
         if not videos:
-            return np.zeros(12)
+            return np.zeros(12, dtype=self.dtype)
 
         views = np.array([v.get('views', 0) for v in videos])
         likes = np.array([v.get('likes', 0) for v in videos])
@@ -84,7 +91,7 @@ class AdvancedEngagementAnalyzer:
             np.mean(np.diff(views)) if len(views) > 1 else 0
         ]
 
-        return np.nan_to_num(features)
+        return np.nan_to_num(features).astype(self.dtype)
 
     def calculate_viral_coefficient(self, features):
         view_consistency = 1 / (1 + features[1] / np.maximum(features[0], 1))
@@ -123,10 +130,17 @@ class AdvancedEngagementAnalyzer:
         self.rf_model.fit(scaled_features, synthetic_targets)
 
         cluster_labels = self.kmeans.fit_predict(scaled_features)
-        self.gb_classifier.fit(scaled_features, cluster_labels)
+        if self.training_mode == 'fast':
+            rows = subsample_rows(len(scaled_features), self.subsample)
+            self.gb_classifier.fit(scaled_features[rows], cluster_labels[rows])
+        else:
+            self.gb_classifier.fit(scaled_features, cluster_labels)
 
         pca_features = self.pca.fit_transform(scaled_features)
 
+        if scaled_features is feature_matrix:
+            self.scaler.inverse_transform(feature_matrix)
+
         return pca_features, cluster_labels
 
     def calculate_sentiment_score(self, features):
@@ -150,20 +164,15 @@ class AdvancedEngagementAnalyzer:
         return weighted_score, components
 
     def classify_sentiment_advanced(self, score, all_scores):
-        percentile = (np.searchsorted(np.sort(all_scores), score) / len(all_scores)) * 100
-
-        if percentile >= 95:
-            return "Extreme Greed"
-        elif percentile >= 80:
-            return "Greed"
-        elif percentile >= 60:
-            return "Neutral"
-        elif percentile >= 40:
-            return "Fear"
-        else:
-            return "Extreme Fear"
+        percentile = np.searchsorted(np.sort(all_scores), score) / len(all_scores)
+        return str(SENTIMENT_LABELS[np.searchsorted(PERCENTILE_CUTS, percentile, side='right')])
 
-    def run_comprehensive_analysis(self):
+    def classify_sentiment_batch(self, scores):
+        scores = np.asarray(scores)
+        percentiles = np.searchsorted(np.sort(scores), scores) / len(scores)
+        return SENTIMENT_LABELS[np.searchsorted(PERCENTILE_CUTS, percentiles, side='right')].tolist()
+
+    def run_comprehensive_analysis(self, sink=None, verbose=True):
         creators_data, video_metrics, engagement_history = self.load_content_data()
 
         print("Advanced YouTube Creator Sentiment Analysis")
@@ -172,6 +181,7 @@ class AdvancedEngagementAnalyzer:
         feature_matrix = []
         creator_names = []
         sentiment_scores = []
+        creator_components = []
 
         for creator, data in creators_data.items():
             features = self.extract_advanced_features(data['videos'])
@@ -180,31 +190,50 @@ class AdvancedEngagementAnalyzer:
             feature_matrix.append(features)
             creator_names.append(creator)
             sentiment_scores.append(score)
+            creator_components.append(components)
 
-            print(f"\n{creator}:")
-            print(f"  Engagement Velocity: {components['engagement_velocity']:.6f}")
-            print(f"  Viral Coefficient: {components['viral_coefficient']:.6f}")
-            print(f"  Audience Retention: {components['audience_retention']:.6f}")
-            print(f"  Growth Momentum: {components['growth_momentum']:.6f}")
-            print(f"  Composite Score: {score:.6f}")
+            if verbose:
+                print(f"\n{creator}:")
+                print(f"  Engagement Velocity: {components['engagement_velocity']:.6f}")
+                print(f"  Viral Coefficient: {components['viral_coefficient']:.6f}")
+                print(f"  Audience Retention: {components['audience_retention']:.6f}")
+                print(f"  Growth Momentum: {components['growth_momentum']:.6f}")
+                print(f"  Composite Score: {score:.6f}")
 
-        feature_matrix = np.array(feature_matrix)
+        feature_matrix = np.array(feature_matrix, dtype=self.dtype)
         pca_features, cluster_labels = self.build_ensemble_model(feature_matrix)
 
-        print("\n" + "=" * 60)
-        print("ADVANCED SENTIMENT CLASSIFICATION")
-        print("=" * 60)
+        if verbose:
+            print("\n" + "=" * 60)
+            print("ADVANCED SENTIMENT CLASSIFICATION")
+            print("=" * 60)
 
-        sentiment_results = {}
-        for i, creator in enumerate(creator_names):
-            sentiment = self.classify_sentiment_advanced(sentiment_scores[i], sentiment_scores)
-            sentiment_results[creator] = sentiment
+        sentiments = self.classify_sentiment_batch(sentiment_scores)
+        sentiment_results = dict(zip(creator_names, sentiments))
 
+        for i, creator in enumerate(creator_names):
             cluster_id = cluster_labels[i]
             pca_coords = pca_features[i]
 
-            print(f"{creator}: {sentiment}")
-            print(f"  Cluster: {cluster_id} | PCA: [{pca_coords[0]:.3f}, {pca_coords[1]:.3f}, {pca_coords[2]:.3f}]")
+            if sink is not None:
+                sink.write({
+                    'creator': creator,
+                    **creator_components[i],
+                    'score': sentiment_scores[i],
+                    'sentiment': sentiments[i],
+                    'cluster': cluster_id,
+                    'pca_1': pca_coords[0],
+                    'pca_2': pca_coords[1],
+                    'pca_3': pca_coords[2]
+                })
+
+            if verbose:
+                print(f"{creator}: {sentiments[i]}")
+                print(f"  Cluster: {cluster_id} | PCA: [{pca_coords[0]:.3f}, {pca_coords[1]:.3f}, {pca_coords[2]:.3f}]")
+
+        if sink is not None:
+            sink.flush()
+            print(f"Wrote {len(creator_names)} creator records to {type(sink).__name__}")
 
         silhouette_avg = silhouette_score(feature_matrix, cluster_labels)
         print(f"\nModel Performance - Silhouette Score: {silhouette_avg:.4f}")
@@ -214,20 +243,26 @@ class AdvancedEngagementAnalyzer:
 
         return sentiment_results
 
-analyzer = AdvancedEngagementAnalyzer()
-results = analyzer.run_comprehensive_analysis()
+def main(sink=None, verbose=True):
+    analyzer = AdvancedEngagementAnalyzer()
+    results = analyzer.run_comprehensive_analysis(sink=sink, verbose=verbose)
+
+    print("\n" + "=" * 60)
+    print("FINAL SENTIMENT DISTRIBUTION")
+    print("=" * 60)
+
+    sentiment_counts = {}
+    for sentiment in results.values():
+        sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
 
-print("\n" + "=" * 60)
-print("FINAL SENTIMENT DISTRIBUTION")
-print("=" * 60)
+    for sentiment, count in sorted(sentiment_counts.items()):
+        percentage = (count / len(results)) * 100
+        print(f"{sentiment}: {count} creators ({percentage:.1f}%)")
 
-sentiment_counts = {}
-for sentiment in results.values():
-    sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
+    print(f"\nTotal Creators Analyzed: {len(results)}")
+    print("Analysis Complete - Advanced ML Pipeline Executed")
 
-for sentiment, count in sorted(sentiment_counts.items()):
-    percentage = (count / len(results)) * 100
-    print(f"{sentiment}: {count} creators ({percentage:.1f}%)")
+    return results
 
-print(f"\nTotal Creators Analyzed: {len(results)}")
-print("Analysis Complete - Advanced ML Pipeline Executed")
\ No newline at end of file
+if __name__ == "__main__":
+    results = main()